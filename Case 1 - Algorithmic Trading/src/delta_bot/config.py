@@ -2,11 +2,11 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Final
 
 
-@dataclass(frozen=True)
+@dataclass(slots=True, frozen=True)
 class SymbolConfig:
     """Per-symbol configuration for level ladders."""
 
@@ -16,9 +16,21 @@ class SymbolConfig:
     base_spread_bps: int
     level_spread_step_bps: int
     max_levels: int
+    level_sizes: tuple[int, ...] = field(init=False, repr=False, compare=False)
+    size_sum: int = field(init=False, repr=False, compare=False)
 
+    def __post_init__(self) -> None:
+        # Unscaled size per level; the int truncation rules out a closed form.
+        sizes = []
+        size = max(1, int(self.base_size))
+        for _ in range(self.max_levels):
+            sizes.append(size)
+            size = max(1, int(size * self.size_multiplier))
+        object.__setattr__(self, "level_sizes", tuple(sizes))
+        object.__setattr__(self, "size_sum", sum(sizes))
 
-@dataclass(frozen=True)
+
+@dataclass(slots=True, frozen=True)
 class RiskLimits:
     max_position: int
     max_dollar_exposure: float
@@ -36,6 +48,8 @@ LOOP_DELAY_SECONDS: Final[float] = 0.01  # 100 Hz target
 MIN_MOVE_TO_REFRESH_BPS: Final[int] = 2
 MAX_ACTIONS_PER_SECOND: Final[int] = 95
 POSITIONS_REFRESH_SECONDS: Final[float] = 1.0
+MARKET_DATA_POLL_SECONDS: Final[float] = LOOP_DELAY_SECONDS
+ORDER_BOOK_DEPTH: Final[int] = 10
 
 MAKER_REBATE_BPS: Final[float] = 2.0
 TAKER_FEE_BPS: Final[float] = 5.0
@@ -70,6 +84,9 @@ INVENTORY_SKEW_BPS: Final[int] = 8
 INVENTORY_PRIORITY_WEIGHT: Final[float] = 120.0  # bps-equivalent boost per 100% inventory usage
 
 HTTP_TIMEOUT_SECONDS: Final[float] = 0.2
+HTTP_CONNECT_TIMEOUT_SECONDS: Final[float] = 0.05
+HTTP_MAX_CONNECTIONS: Final[int] = 8
+HTTP_KEEPALIVE_EXPIRY_SECONDS: Final[float] = 60.0
 HTTP_MAX_RETRIES: Final[int] = 3
 
 EXCHANGE_HOST: Final[str] = "159.65.173.202"
@@ -83,6 +100,9 @@ DEFAULT_TEAM_TOKEN: Final[str] = "shortinggpa-129asfasd301"
 
 SYMBOL_IDS: Final[dict[str, int]] = {"XYZ": 1, "ETF": 2, "ABC": 3, "DEF": 4}
 ID_TO_SYMBOL: Final[dict[int, str]] = {value: key for key, value in SYMBOL_IDS.items()}
+ID_TO_SYMBOL_ARR: Final[tuple[str | None, ...]] = tuple(
+    ID_TO_SYMBOL.get(symbol_id) for symbol_id in range(max(ID_TO_SYMBOL) + 1)
+)
 ORDER_PRICE_SCALE: Final[int] = 100  # cents per dollar
 
 MISPRICING_INTENSITY_BPS: Final[float] = 40.0
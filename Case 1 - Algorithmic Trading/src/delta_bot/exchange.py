@@ -8,15 +8,15 @@ import logging
 import os
 import struct
 import time
-from typing import Callable, Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 
 import httpx
+import orjson
 from exchange_sdk import ExchangeClient as BaseGatewayClient
 from exchange_sdk.client import GatewayConfig, MarketDataConfig, ORDER_FMT
 
 from . import config
 from .models import (
-    MarketLevel,
     MarketSnapshot,
     OrderBook,
     OrderInfo,
@@ -26,37 +26,74 @@ from .models import (
 
 _LOGGER = logging.getLogger(__name__)
 
+# (symbol_id, side, price_ticks, quantity, client_id, order_id) straight off the fill frame.
+FillCallback = Callable[[int, int, int, int, int, int], None]
+_ORDER_STRUCT = struct.Struct(ORDER_FMT)
+
+
+_PRICE_KEYS = ("price", "p")
+_SIZE_KEYS = ("quantity", "qty", "size")
+
+
+def _book_columns(entries: list[dict]) -> tuple[list[float], list[int]]:
+    """Split book entries into price/size columns.
+
+    The scorekeeper uses one key spelling per response, so the keys are
+    resolved from the first entry instead of probed on every level.
+    """
+
+    if not entries:
+        return [], []
+    first = entries[0]
+    price_key = next((key for key in _PRICE_KEYS if key in first), None)
+    size_key = next((key for key in _SIZE_KEYS if key in first), None)
+    prices = [float(entry.get(price_key) or 0.0) for entry in entries]
+    sizes = [int(entry.get(size_key) or 0) for entry in entries]
+    return prices, sizes
+
 
 class StreamingGatewayClient(BaseGatewayClient):
     """Extends the SDK client so we can surface fills to strategy code."""
 
     RESPONSE_SIZE = 64
+    READ_CHUNK_SIZE = 65_536
 
-    def __init__(self, *args, fill_callback: Callable[[dict], None] | None = None, **kwargs) -> None:
+    def __init__(self, *args, fill_callback: FillCallback | None = None, **kwargs) -> None:
         super().__init__(*args, **kwargs)
-        self._fill_callbacks: List[Callable[[dict], None]] = []
+        # Copy-on-write tuples: registration rebinds, so iteration needs no copy.
+        self._fill_callbacks: Tuple[FillCallback, ...] = ()
+        self._rx_buffer = bytearray()
         if fill_callback:
-            self._fill_callbacks.append(fill_callback)
+            self._fill_callbacks = (fill_callback,)
 
-    def add_fill_callback(self, callback: Callable[[dict], None]) -> None:
-        self._fill_callbacks.append(callback)
+    def add_fill_callback(self, callback: FillCallback) -> None:
+        self._fill_callbacks = self._fill_callbacks + (callback,)
 
     async def _read_responses(self) -> None:  # type: ignore[override]
         if not self._tcp_reader:
             _LOGGER.warning("Gateway reader missing when response loop started")
             return
+        frame_size = self.RESPONSE_SIZE
+        buffer = self._rx_buffer
+        buffer.clear()
         try:
             while True:
-                try:
-                    frame = await self._tcp_reader.readexactly(self.RESPONSE_SIZE)
-                    self._handle_response_frame(frame)
-                except asyncio.IncompleteReadError as exc:
-                    if len(exc.partial) == 0:
-                        _LOGGER.info("Gateway closed connection")
-                        break
-                    _LOGGER.warning(
-                        "incomplete response frame: received %s bytes", len(exc.partial)
-                    )
+                chunk = await self._tcp_reader.read(self.READ_CHUNK_SIZE)
+                if not chunk:
+                    if buffer:
+                        _LOGGER.warning(
+                            "incomplete response frame: received %s bytes", len(buffer)
+                        )
+                    _LOGGER.info("Gateway closed connection")
+                    break
+                buffer += chunk
+                offset = 0
+                end = len(buffer) - frame_size
+                while offset <= end:
+                    self._handle_response_frame(buffer, offset)
+                    offset += frame_size
+                if offset:
+                    del buffer[:offset]
         except (ConnectionResetError, EOFError) as exc:
             _LOGGER.info("gateway connection closed: %s", exc.__class__.__name__)
         except asyncio.CancelledError:
@@ -64,28 +101,23 @@ class StreamingGatewayClient(BaseGatewayClient):
         except Exception as exc:  # pragma: no cover - defensive logging
             _LOGGER.error("gateway response loop error: %s", exc)
 
-    def _handle_response_frame(self, frame: bytes) -> None:
+    def _handle_response_frame(self, buffer: bytes | bytearray, offset: int = 0) -> None:
         if not self._fill_callbacks:
             return
         try:
-            unpacked = struct.unpack(ORDER_FMT, frame)
+            unpacked = _ORDER_STRUCT.unpack_from(buffer, offset)
         except struct.error as exc:
             _LOGGER.debug("response unpack failed: %s", exc)
             return
         msg_type = unpacked[6]
         if msg_type != 2:  # 2 == fill/execute
             return
-        payload = {
-            "client_id": unpacked[0],
-            "order_id": unpacked[1],
-            "symbol_id": unpacked[2],
-            "side": unpacked[3],
-            "price_ticks": unpacked[7],
-            "quantity": abs(unpacked[8]),
-        }
-        for callback in list(self._fill_callbacks):
+        client_id, order_id, symbol_id, side = unpacked[:4]
+        price_ticks = unpacked[7]
+        quantity = abs(unpacked[8])
+        for callback in self._fill_callbacks:
             try:
-                callback(payload)
+                callback(symbol_id, side, price_ticks, quantity, client_id, order_id)
             except Exception:  # pragma: no cover - defensive logging
                 _LOGGER.exception("fill callback failed")
 
@@ -103,7 +135,7 @@ class ExchangeClient:
         gateway_cfg = GatewayConfig(host=config.EXCHANGE_HOST, port=config.GATEWAY_PORT)
         market_cfg = MarketDataConfig(host=config.EXCHANGE_HOST, port=config.MARKET_DATA_PORT)
 
-        self._fill_handlers: list[Callable[[str, Side, int, float], None]] = []
+        self._fill_handlers: Tuple[Callable[[str, Side, int, float], None], ...] = ()
         self._gateway = StreamingGatewayClient(
             team_token=token,
             gateway=gateway_cfg,
@@ -112,92 +144,135 @@ class ExchangeClient:
         )
         self._http = httpx.AsyncClient(
             base_url=config.SCOREKEEPER_BASE_URL,
-            timeout=config.HTTP_TIMEOUT_SECONDS,
+            timeout=httpx.Timeout(
+                config.HTTP_TIMEOUT_SECONDS, connect=config.HTTP_CONNECT_TIMEOUT_SECONDS
+            ),
+            limits=httpx.Limits(
+                max_connections=config.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=config.HTTP_MAX_CONNECTIONS,
+                keepalive_expiry=config.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+            ),
         )
         self._client_ids = itertools.count(1)
         self._order_client_map: Dict[int, int] = {}
         self._order_symbol_map: Dict[int, int] = {}
+        self._books: Dict[str, MarketSnapshot] = {}
+        self._feed_tasks: List[asyncio.Task] = []
 
     async def __aenter__(self) -> "ExchangeClient":
         await self._gateway.connect()
+        self._feed_tasks = [
+            asyncio.create_task(self._stream_order_book(symbol)) for symbol in config.ALL_SYMBOLS
+        ]
         return self
 
     async def __aexit__(self, exc_type, exc, tb) -> None:  # type: ignore[override]
+        for task in self._feed_tasks:
+            task.cancel()
+        await asyncio.gather(*self._feed_tasks, return_exceptions=True)
+        self._feed_tasks = []
         await self._gateway.close()
         await self._http.aclose()
 
-    async def get_order_book(self, symbol: str, depth: int = 10) -> MarketSnapshot:
-        response = await self._http.get(f"/orderbook/{symbol}", params={"depth": depth})
+    @property
+    def order_books(self) -> Dict[str, MarketSnapshot]:
+        """Latest snapshot per symbol, kept warm by the background feed tasks."""
+
+        return self._books
+
+    async def get_order_book(self, symbol: str, depth: int = config.ORDER_BOOK_DEPTH) -> MarketSnapshot:
+        return await self._fetch_order_book(symbol, f"/orderbook/{symbol}", {"depth": depth}, depth)
+
+    async def _fetch_order_book(
+        self, symbol: str, path: str, params: dict[str, int], depth: int
+    ) -> MarketSnapshot:
+        response = await self._http.get(path, params=params)
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
+        bid_prices, bid_sizes = _book_columns(data.get("bids", [])[:depth])
+        ask_prices, ask_sizes = _book_columns(data.get("asks", [])[:depth])
         order_book = OrderBook(
-            bids=[self._to_level(entry) for entry in data.get("bids", [])[:depth]],
-            asks=[self._to_level(entry) for entry in data.get("asks", [])[:depth]],
+            bid_prices=bid_prices,
+            bid_sizes=bid_sizes,
+            ask_prices=ask_prices,
+            ask_sizes=ask_sizes,
         )
         return MarketSnapshot(symbol=symbol, order_book=order_book, timestamp=time.time())
 
     async def place_order(self, level: OrderLevel) -> OrderInfo:
         client_id = next(self._client_ids)
-        symbol_id = config.SYMBOL_IDS[level.symbol]
-        price_ticks = self._price_to_ticks(level.price)
-        side = 0 if level.side is Side.BID else 1
         order_id = await self._gateway.send_new_async(
             client_id=client_id,
-            symbol_id=symbol_id,
-            side=side,
-            price_ticks=price_ticks,
+            symbol_id=level.symbol_id,
+            side=level.side_int,
+            price_ticks=level.price_ticks,
             quantity=level.size,
         )
         self._order_client_map[order_id] = client_id
-        self._order_symbol_map[order_id] = symbol_id
+        self._order_symbol_map[order_id] = level.symbol_id
         return OrderInfo(
             symbol=level.symbol,
             side=level.side,
             level_index=level.level_index,
-            price=level.price,
+            price_ticks=level.price_ticks,
             size=level.size,
-            order_id=str(order_id),
+            symbol_id=level.symbol_id,
+            side_int=level.side_int,
+            order_id=order_id,
         )
 
-    async def cancel_order(self, order_id: str) -> None:
-        order_int = int(order_id)
-        client_id = self._order_client_map.get(order_int, order_int)
-        symbol_id = self._order_symbol_map.get(order_int, config.SYMBOL_IDS[config.ETF_SYMBOL])
+    async def cancel_order(self, order_id: int) -> None:
+        client_id = self._order_client_map.get(order_id, order_id)
+        symbol_id = self._order_symbol_map.get(order_id, config.SYMBOL_IDS[config.ETF_SYMBOL])
         await self._gateway.cancel_order_async(
             client_id=client_id,
-            order_id=order_int,
+            order_id=order_id,
             symbol_id=symbol_id,
         )
-        self._order_client_map.pop(order_int, None)
-        self._order_symbol_map.pop(order_int, None)
+        self._order_client_map.pop(order_id, None)
+        self._order_symbol_map.pop(order_id, None)
 
-    async def replace_order(self, order_id: str, level: OrderLevel) -> OrderInfo:
+    async def replace_order(self, order_id: int, level: OrderLevel) -> OrderInfo:
         await self.cancel_order(order_id)
         return await self.place_order(level)
 
     def register_fill_handler(self, handler: Callable[[str, Side, int, float], None]) -> None:
-        self._fill_handlers.append(handler)
+        self._fill_handlers = self._fill_handlers + (handler,)
 
-    def _to_level(self, entry: dict) -> MarketLevel:
-        price = float(entry.get("price", entry.get("p", 0.0)))
-        size_value = entry.get("quantity") or entry.get("qty") or entry.get("size") or 0
-        size = int(size_value)
-        return MarketLevel(price=price, size=size)
+    async def _stream_order_book(self, symbol: str) -> None:
+        """Keep ``self._books[symbol]`` fresh without blocking the quoting loop."""
 
-    def _price_to_ticks(self, price: float) -> int:
-        return int(round(price * config.ORDER_PRICE_SCALE))
+        depth = config.ORDER_BOOK_DEPTH
+        path = f"/orderbook/{symbol}"
+        params = {"depth": depth}
+        while True:
+            fetch_start = time.perf_counter()
+            try:
+                self._books[symbol] = await self._fetch_order_book(symbol, path, params, depth)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                _LOGGER.debug("orderbook refresh failed for %s: %s", symbol, exc)
+            elapsed = time.perf_counter() - fetch_start
+            await asyncio.sleep(max(0.0, config.MARKET_DATA_POLL_SECONDS - elapsed))
 
-    def _on_gateway_fill(self, payload: dict) -> None:
-        symbol = config.ID_TO_SYMBOL.get(payload.get("symbol_id"))
-        if symbol is None:
+    def _on_gateway_fill(
+        self,
+        symbol_id: int,
+        side_int: int,
+        price_ticks: int,
+        quantity: int,
+        client_id: int,
+        order_id: int,
+    ) -> None:
+        if quantity <= 0 or not 0 <= symbol_id < len(config.ID_TO_SYMBOL_ARR):
             return
-        quantity = int(payload.get("quantity", 0))
-        if quantity <= 0:
+        symbol = config.ID_TO_SYMBOL_ARR[symbol_id]
+        if symbol is None:
             return
-        side = Side.BID if int(payload.get("side", 0)) == 0 else Side.ASK
-        price_ticks = int(payload.get("price_ticks", 0))
+        side = Side.BID if side_int == 0 else Side.ASK
         price = price_ticks / config.ORDER_PRICE_SCALE
-        for handler in list(self._fill_handlers):
+        for handler in self._fill_handlers:
             try:
                 handler(symbol, side, quantity, price)
             except Exception:  # pragma: no cover - defensive logging
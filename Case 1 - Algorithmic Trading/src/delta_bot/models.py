@@ -17,29 +17,31 @@ class Side(str, Enum):
         return Side.ASK if self is Side.BID else Side.BID
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class OrderLevel:
     symbol: str
     side: Side
     level_index: int
-    price: float
+    price_ticks: int
     size: int
+    symbol_id: int
+    side_int: int  # wire encoding: 0 = bid, 1 = ask
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class OrderInfo(OrderLevel):
-    order_id: str
+    order_id: int
     timestamp: float = field(default_factory=time.time)
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class PositionState:
     symbol: str
     position: int = 0
     vwap: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class PnLState:
     realized: float = 0.0
     unrealized: float = 0.0
@@ -51,30 +53,27 @@ class PnLState:
         )
 
 
-@dataclass
-class MarketLevel:
-    price: float
-    size: int
-
-
-@dataclass
+@dataclass(slots=True, eq=False)
 class OrderBook:
-    bids: List[MarketLevel]
-    asks: List[MarketLevel]
+    """Book sides stored column-wise, best level first."""
+
+    bid_prices: List[float]
+    bid_sizes: List[int]
+    ask_prices: List[float]
+    ask_sizes: List[int]
 
     @property
     def mid(self) -> Optional[float]:
-        if not self.bids or not self.asks:
+        if not self.bid_prices or not self.ask_prices:
             return None
-        return (self.bids[0].price + self.asks[0].price) / 2.0
+        return (self.bid_prices[0] + self.ask_prices[0]) * 0.5
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class MarketSnapshot:
     symbol: str
     order_book: OrderBook
     timestamp: float
 
 
-ActiveOrders = Dict[str, Dict[Side, Dict[int, OrderInfo | None]]]
 Positions = Dict[str, PositionState]
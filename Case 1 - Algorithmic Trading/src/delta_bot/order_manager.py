@@ -4,97 +4,159 @@ from __future__ import annotations
 
 import asyncio
 import time
-from typing import Dict, Iterable
+from array import array
+from collections import deque
+from typing import Awaitable, Dict, Iterable
 
 from . import config
 from .exchange import ExchangeClient
-from .models import ActiveOrders, OrderInfo, OrderLevel, Side
+from .models import OrderInfo, OrderLevel
 
+_NO_ORDER = -1
 
-def _bps_distance(a: float, b: float) -> float:
-    if a <= 0 or b <= 0:
-        return float("inf")
-    mid = (a + b) / 2.0
-    return abs(a - b) / mid * 10_000
+
+def _bps_distance(a_ticks: int, b_ticks: int) -> int:
+    """Whole bps between two tick prices, measured against their midpoint."""
+
+    return abs(a_ticks - b_ticks) * 20_000 // (a_ticks + b_ticks)
 
 
 class OrderLadderManager:
-    """Keeps ladder state aligned with desired levels while respecting rate limits."""
+    """Keeps ladder state aligned with desired levels while respecting rate limits.
+
+    Resting orders live in flat parallel arrays indexed by
+    ``slot = slot_base[symbol] + side * max_levels + level_index`` (bids first,
+    then asks) so a ladder sweep is plain index arithmetic. Every symbol owns
+    disjoint slots and only the strategy loop drives the manager, so no lock
+    is needed; the rate limit is a sliding one-second window of action times.
+    """
 
     def __init__(self, client: ExchangeClient, symbol_configs: Dict[str, config.SymbolConfig]):
         self.client = client
         self.symbol_configs = symbol_configs
-        self.active_orders: ActiveOrders = {
-            symbol: {Side.BID: {}, Side.ASK: {}} for symbol in symbol_configs
-        }
-        self._window_start = time.monotonic()
-        self._actions_this_window = 0
-        self._lock = asyncio.Lock()
+        self._slot_base: Dict[str, int] = {}
+        slot_count = 0
+        for symbol, symbol_config in symbol_configs.items():
+            self._slot_base[symbol] = slot_count
+            slot_count += 2 * symbol_config.max_levels
+        self._order_id = array("q", [_NO_ORDER]) * slot_count
+        self._price_ticks = array("q", [0]) * slot_count
+        self._size = array("q", [0]) * slot_count
+        self._action_times: deque[float] = deque()
 
     async def sync_symbol(self, symbol: str, bids: list[OrderLevel], asks: list[OrderLevel]) -> None:
-        async with self._lock:
-            await self._sync_side(symbol, Side.BID, bids)
-            await self._sync_side(symbol, Side.ASK, asks)
-            await self._prune_levels(symbol, Side.BID, {lvl.level_index for lvl in bids})
-            await self._prune_levels(symbol, Side.ASK, {lvl.level_index for lvl in asks})
+        bid_base = self._slot_base[symbol]
+        max_levels = self.symbol_configs[symbol].max_levels
+        ask_base = bid_base + max_levels
+        slots: list[int] = []
+        actions: list[Awaitable[OrderInfo | None]] = []
+        self._plan_side(bid_base, bids, slots, actions)
+        self._plan_side(ask_base, asks, slots, actions)
+        self._plan_prune(bid_base, max_levels, _level_mask(bids), slots, actions)
+        self._plan_prune(ask_base, max_levels, _level_mask(asks), slots, actions)
+        await self._dispatch(slots, actions)
 
     async def cancel_all(self) -> None:
-        async with self._lock:
-            for symbol in list(self.active_orders):
-                for side in (Side.BID, Side.ASK):
-                    for info in list(self.active_orders[symbol][side].values()):
-                        if info is None:
-                            continue
-                        await self._throttled_cancel(info)
-                    self.active_orders[symbol][side].clear()
-
-    async def _sync_side(self, symbol: str, side: Side, desired: Iterable[OrderLevel]) -> None:
+        slots: list[int] = []
+        actions: list[Awaitable[OrderInfo | None]] = []
+        self._plan_prune(0, len(self._order_id), 0, slots, actions)
+        await self._dispatch(slots, actions)
+
+    def _plan_side(
+        self,
+        base: int,
+        desired: Iterable[OrderLevel],
+        slots: list[int],
+        actions: list[Awaitable[OrderInfo | None]],
+    ) -> None:
         for level in desired:
-            existing = self.active_orders[symbol][side].get(level.level_index)
-            if existing is None:
-                info = await self._throttled_place(level)
-                self.active_orders[symbol][side][level.level_index] = info
-            elif self._needs_refresh(existing, level):
-                info = await self._throttled_replace(existing, level)
-                self.active_orders[symbol][side][level.level_index] = info
-
-    async def _prune_levels(self, symbol: str, side: Side, desired_indexes: set[int]) -> None:
-        for level_index, info in list(self.active_orders[symbol][side].items()):
-            if level_index in desired_indexes:
+            slot = base + level.level_index
+            order_id = self._order_id[slot]
+            if order_id == _NO_ORDER:
+                actions.append(self._throttled_place(level))
+            elif self._needs_refresh(slot, level):
+                actions.append(self._throttled_replace(order_id, level))
+            else:
                 continue
-            if info is None:
+            slots.append(slot)
+
+    def _plan_prune(
+        self,
+        base: int,
+        count: int,
+        desired_mask: int,
+        slots: list[int],
+        actions: list[Awaitable[OrderInfo | None]],
+    ) -> None:
+        order_ids = self._order_id
+        for level_index in range(count):
+            if desired_mask >> level_index & 1:
                 continue
-            await self._throttled_cancel(info)
-            del self.active_orders[symbol][side][level_index]
-
-    def _needs_refresh(self, existing: OrderInfo, desired: OrderLevel) -> bool:
-        if existing.size != desired.size:
+            slot = base + level_index
+            order_id = order_ids[slot]
+            if order_id == _NO_ORDER:
+                continue
+            actions.append(self._throttled_cancel(order_id))
+            slots.append(slot)
+
+    async def _dispatch(self, slots: list[int], actions: list[Awaitable[OrderInfo | None]]) -> None:
+        """Run planned actions concurrently, then record every outcome that landed."""
+
+        if not actions:
+            return
+        results = await asyncio.gather(*actions, return_exceptions=True)
+        error: BaseException | None = None
+        for slot, result in zip(slots, results):
+            if isinstance(result, BaseException):
+                error = error or result
+            elif result is None:
+                self._order_id[slot] = _NO_ORDER
+            else:
+                self._store(slot, result)
+        if error is not None:
+            raise error
+
+    def _store(self, slot: int, info: OrderInfo) -> None:
+        self._order_id[slot] = info.order_id
+        self._price_ticks[slot] = info.price_ticks
+        self._size[slot] = info.size
+
+    def _needs_refresh(self, slot: int, desired: OrderLevel) -> bool:
+        if self._size[slot] != desired.size:
             return True
-        return _bps_distance(existing.price, desired.price) >= config.MIN_MOVE_TO_REFRESH_BPS
+        moved_bps = _bps_distance(self._price_ticks[slot], desired.price_ticks)
+        return moved_bps >= config.MIN_MOVE_TO_REFRESH_BPS
 
     async def _throttled_place(self, level: OrderLevel) -> OrderInfo:
         await self._reserve_action_slot()
         return await self.client.place_order(level)
 
-    async def _throttled_replace(self, existing: OrderInfo, level: OrderLevel) -> OrderInfo:
+    async def _throttled_replace(self, order_id: int, level: OrderLevel) -> OrderInfo:
         await self._reserve_action_slot()
-        return await self.client.replace_order(existing.order_id, level)
+        return await self.client.replace_order(order_id, level)
 
-    async def _throttled_cancel(self, info: OrderInfo) -> None:
+    async def _throttled_cancel(self, order_id: int) -> None:
         await self._reserve_action_slot()
-        await self.client.cancel_order(info.order_id)
+        await self.client.cancel_order(order_id)
 
     async def _reserve_action_slot(self) -> None:
+        action_times = self._action_times
         while True:
             now = time.monotonic()
-            elapsed = now - self._window_start
-            if elapsed >= 1.0:
-                self._window_start = now
-                self._actions_this_window = 0
-            if self._actions_this_window < config.MAX_ACTIONS_PER_SECOND:
-                self._actions_this_window += 1
+            cutoff = now - 1.0
+            while action_times and action_times[0] <= cutoff:
+                action_times.popleft()
+            if len(action_times) < config.MAX_ACTIONS_PER_SECOND:
+                action_times.append(now)
                 return
-            await asyncio.sleep(max(0.0, 1.0 - elapsed))
+            await asyncio.sleep(action_times[0] - cutoff)
+
+
+def _level_mask(levels: Iterable[OrderLevel]) -> int:
+    mask = 0
+    for level in levels:
+        mask |= 1 << level.level_index
+    return mask
 
 
 __all__ = ["OrderLadderManager"]
@@ -9,7 +9,7 @@ from . import config
 from .models import MarketSnapshot, OrderLevel, Side
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class QuoteContext:
     fair_value: float
     volatility_bps: float
@@ -35,62 +35,56 @@ def build_ladders(
     mid = ctx.fair_value or snapshot.order_book.mid
     if mid is None or mid <= 0:
         return [], []
+    mid_ticks = int(round(mid * config.ORDER_PRICE_SCALE))
 
     base_spread = (symbol_config.base_spread_bps * ctx.spread_scale) + ctx.volatility_bps
     level_step = symbol_config.level_spread_step_bps * ctx.spread_scale
-    size_seed = max(1, int(symbol_config.base_size))
     maker_edge = config.EFFECTIVE_MAKER_EDGE_BPS / 2.0
+    bid_base_bps = base_spread + max(ctx.inventory_skew_bps, 0) - maker_edge
+    ask_base_bps = base_spread + max(-ctx.inventory_skew_bps, 0) - maker_edge
+    size_scale = ctx.size_scale
+    bid_size_scale = ctx.bid_size_scale
+    ask_size_scale = ctx.ask_size_scale
+    symbol = snapshot.symbol
+    symbol_id = config.SYMBOL_IDS[symbol]
 
     bids: list[OrderLevel] = []
     asks: list[OrderLevel] = []
 
-    current_size = size_seed
-    for level_index in range(symbol_config.max_levels):
-        offset_bps = base_spread + level_index * level_step
-        base_size = max(1, int(current_size * ctx.size_scale))
-        bid_size = max(1, int(base_size * ctx.bid_size_scale))
-        ask_size = max(1, int(base_size * ctx.ask_size_scale))
-
-        bid_bps = offset_bps + max(ctx.inventory_skew_bps, 0)
-        ask_bps = offset_bps + max(-ctx.inventory_skew_bps, 0)
-
-        bid_price = _price_from_bps(mid, bid_bps - maker_edge, Side.BID)
-        ask_price = _price_from_bps(mid, ask_bps - maker_edge, Side.ASK)
-
+    for level_index, level_size in enumerate(symbol_config.level_sizes):
+        offset_bps = level_index * level_step
+        base_size = max(1, int(level_size * size_scale))
+        # Ticks for mid * bps / 10_000, rounded half up, with a 1 bps floor.
+        bid_delta = (int(mid_ticks * max(1.0, bid_base_bps + offset_bps)) + 5_000) // 10_000
+        ask_delta = (int(mid_ticks * max(1.0, ask_base_bps + offset_bps)) + 5_000) // 10_000
         bids.append(
             OrderLevel(
-                symbol=snapshot.symbol,
+                symbol=symbol,
                 side=Side.BID,
                 level_index=level_index,
-                price=bid_price,
-                size=bid_size,
+                price_ticks=max(1, mid_ticks - bid_delta),
+                size=max(1, int(base_size * bid_size_scale)),
+                symbol_id=symbol_id,
+                side_int=0,
             )
         )
         asks.append(
             OrderLevel(
-                symbol=snapshot.symbol,
+                symbol=symbol,
                 side=Side.ASK,
                 level_index=level_index,
-                price=ask_price,
-                size=ask_size,
+                price_ticks=mid_ticks + ask_delta,
+                size=max(1, int(base_size * ask_size_scale)),
+                symbol_id=symbol_id,
+                side_int=1,
             )
         )
 
-        current_size = max(1, int(current_size * symbol_config.size_multiplier))
-
     return bids, asks
 
 
 def estimate_notional(levels: Iterable[OrderLevel]) -> float:
-    return sum(level.price * level.size for level in levels)
-
-
-def _price_from_bps(mid: float, bps: float, side: Side) -> float:
-    effective_bps = max(1.0, bps)
-    delta = mid * (effective_bps / 10_000)
-    if side is Side.BID:
-        return max(0.01, mid - delta)
-    return mid + delta
+    return sum(level.price_ticks * level.size for level in levels) / config.ORDER_PRICE_SCALE
 
 
 __all__ = ["QuoteContext", "compute_inventory_skew", "build_ladders", "estimate_notional"]
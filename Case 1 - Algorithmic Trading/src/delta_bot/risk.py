@@ -5,7 +5,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 
 from . import config
-from .models import PnLState, Positions
+from .models import PnLState, PositionState, Positions
 
 
 @dataclass
@@ -14,27 +14,61 @@ class RiskState:
     throttled: bool = False
 
 
+def position_exposure(state: PositionState, mid: float | None) -> float:
+    if mid is None:
+        return 0.0
+    return abs(state.position * mid)
+
+
+def position_unrealized(state: PositionState, mid: float | None) -> float:
+    if mid is None:
+        return 0.0
+    return state.position * (mid - state.vwap)
+
+
 def compute_dollar_exposure(positions: Positions, mid_map: dict[str, float]) -> float:
     exposure = 0.0
     for symbol, state in positions.items():
-        mid = mid_map.get(symbol)
-        if mid is None:
-            continue
-        exposure += abs(state.position * mid)
+        exposure += position_exposure(state, mid_map.get(symbol))
     return exposure
 
 
 def update_unrealized_pnl(pnl: PnLState, positions: Positions, mid_map: dict[str, float]) -> None:
     unrealized = 0.0
     for symbol, state in positions.items():
-        mid = mid_map.get(symbol)
-        if mid is None:
-            continue
-        unrealized += state.position * (mid - state.vwap)
+        unrealized += position_unrealized(state, mid_map.get(symbol))
     pnl.unrealized = unrealized
     pnl.update_high_watermark()
 
 
+def apply_fill(
+    position: int, signed_qty: int, vwap: float, price: float
+) -> tuple[int, float, float]:
+    """Apply a signed fill; returns ``(new_position, new_vwap, realized_delta)``.
+
+    Opening from flat and adding to an existing position are the common
+    cases and are handled first; reducing or flipping through zero is the
+    cold tail.
+    """
+
+    if position == 0:
+        return signed_qty, (price if signed_qty else vwap), 0.0
+
+    new_position = position + signed_qty
+    if position * signed_qty > 0:
+        held = abs(position)
+        added = abs(signed_qty)
+        return new_position, (vwap * held + price * added) / (held + added), 0.0
+
+    if position > 0:
+        realized = min(position, -signed_qty) * (price - vwap)
+    else:
+        realized = min(-position, signed_qty) * (vwap - price)
+    if new_position == 0 or new_position * signed_qty > 0:
+        vwap = price
+    return new_position, vwap, realized
+
+
 def compute_drawdown_pct(pnl: PnLState) -> float:
     equity = pnl.realized + pnl.unrealized
     if pnl.equity_high_watermark <= 0:
@@ -63,8 +97,11 @@ def drawdown_adjustments(drawdown_pct: float) -> tuple[float, float, bool]:
 
 __all__ = [
     "RiskState",
+    "position_exposure",
+    "position_unrealized",
     "compute_dollar_exposure",
     "update_unrealized_pnl",
+    "apply_fill",
     "compute_drawdown_pct",
     "drawdown_adjustments",
 ]
@@ -5,6 +5,7 @@ from __future__ import annotations
 import asyncio
 import logging
 import time
+from array import array
 from typing import Dict, Optional
 
 from . import config
@@ -25,16 +26,54 @@ class Strategy:
     def __init__(self, client: ExchangeClient) -> None:
         self.client = client
         self.symbol_configs = config.DEFAULT_SYMBOL_CONFIG
+        # Fixed (symbol, config) pairs for per-tick loops, avoiding items() views.
+        self._symbol_configs_tuple = tuple(self.symbol_configs.items())
         self.positions: Dict[str, PositionState] = {
             symbol: PositionState(symbol=symbol) for symbol in config.ALL_SYMBOLS
         }
         self.pnl = PnLState()
         self.market: Dict[str, MarketSnapshot] = {}
-        self._volatility_bps: Dict[str, float] = {
-            symbol: float(self.symbol_configs[symbol].base_spread_bps)
+        self._mid_map: Dict[str, float] = {}
+        # Per-symbol risk contributions plus their running totals, refreshed
+        # only when that symbol's mid or position changes.
+        self._exposure_by_symbol: Dict[str, float] = {symbol: 0.0 for symbol in config.ALL_SYMBOLS}
+        self._unrealized_by_symbol: Dict[str, float] = {symbol: 0.0 for symbol in config.ALL_SYMBOLS}
+        self._exposure = 0.0
+        self._unrealized = 0.0
+        # Per-symbol volatility state, indexed by position in config.ALL_SYMBOLS.
+        self._symbol_index: Dict[str, int] = {
+            symbol: index for index, symbol in enumerate(config.ALL_SYMBOLS)
+        }
+        self._volatility_bps = array(
+            "d", (float(self.symbol_configs[symbol].base_spread_bps) for symbol in config.ALL_SYMBOLS)
+        )
+        self._last_mid = array("d", [0.0]) * len(config.ALL_SYMBOLS)  # 0.0 = no mid yet
+        self._vol_decay = 1.0 - config.VOL_SMOOTHING_ALPHA
+        self._vol_gain = config.VOL_SMOOTHING_ALPHA * 10_000  # folds the bps scaling into alpha
+        self._last_quote_ctx: Dict[str, QuoteContext] = {}
+        self._priority_buf = [0.0] * len(config.ALL_SYMBOLS)
+        # Static per-symbol mispricing inputs, resolved once instead of per tick.
+        self._is_etf: Dict[str, bool] = {
+            symbol: symbol == config.ETF_SYMBOL for symbol in config.ALL_SYMBOLS
+        }
+        self._weights: Dict[str, float] = {
+            symbol: 1.0 if self._is_etf[symbol] else config.SYNTHETIC_WEIGHTS.get(symbol, 0.0)
             for symbol in config.ALL_SYMBOLS
         }
-        self._last_mid: Dict[str, Optional[float]] = {symbol: None for symbol in config.ALL_SYMBOLS}
+        # +1 for the ETF, -1 for constituents: the rich side flips between them.
+        self._etf_sign: Dict[str, float] = {
+            symbol: 1.0 if self._is_etf[symbol] else -1.0 for symbol in config.ALL_SYMBOLS
+        }
+        self._priority_bonus: Dict[str, float] = {
+            symbol: 10.0 if self._is_etf[symbol] else 0.0 for symbol in config.ALL_SYMBOLS
+        }
+        self._inventory_priority_scale = config.INVENTORY_PRIORITY_WEIGHT / max(
+            1, config.RISK_LIMITS.max_position
+        )
+        self._intensity_denom = max(1.0, config.MISPRICING_INTENSITY_BPS)
+        self._spread_widen = config.MISPRICING_SPREAD_WIDEN
+        self._size_bonus = config.MISPRICING_SIZE_BONUS
+        self._size_penalty = config.MISPRICING_SIZE_PENALTY
         self._order_manager = OrderLadderManager(client, self.symbol_configs)
         self._logger = logging.getLogger(__name__)
         self._last_metrics_log = 0.0
@@ -43,22 +82,24 @@ class Strategy:
     async def run(self) -> None:
         while True:
             loop_start = time.perf_counter()
-            await self._refresh_order_books()
-            mid_map = self._mid_map()
+            self._refresh_order_books()
+            mid_map = self._mid_map
             if not mid_map:
-                await self._sleep(loop_start)
+                await self._sleep(loop_start, time.perf_counter())
                 continue
 
-            risk.update_unrealized_pnl(self.pnl, self.positions, mid_map)
+            self.pnl.unrealized = self._unrealized
+            self.pnl.update_high_watermark()
             drawdown_pct = risk.compute_drawdown_pct(self.pnl)
             spread_scale, size_scale, throttled = risk.drawdown_adjustments(drawdown_pct)
-            exposure = risk.compute_dollar_exposure(self.positions, mid_map)
+            exposure = self._exposure
             size_scale *= self._exposure_size_scale(exposure)
             size_scale *= self._resting_notional_scale(mid_map)
 
             if throttled or size_scale == 0.0:
                 await self._order_manager.cancel_all()
-                await self._sleep(loop_start)
+                self._last_quote_ctx.clear()
+                await self._sleep(loop_start, time.perf_counter())
                 continue
 
             synthetic_fair = self._compute_synthetic_fair(mid_map)
@@ -70,56 +111,43 @@ class Strategy:
                 size_scale,
                 etf_mispricing_bps,
             )
-            self._maybe_log_metrics(etf_mispricing_bps, exposure, drawdown_pct, size_scale)
-            await self._sleep(loop_start)
+            now = time.perf_counter()
+            self._maybe_log_metrics(now, etf_mispricing_bps, exposure, drawdown_pct, size_scale)
+            await self._sleep(loop_start, now)
 
     def register_fill(self, symbol: str, side: Side, size: int, price: float) -> None:
         """Ingest a fill event to update inventory and realized PnL."""
 
         state = self.positions[symbol]
         signed_qty = size if side is Side.BID else -size
-        pre_position = state.position
-
-        if pre_position > 0 and signed_qty < 0:
-            closing = min(pre_position, abs(signed_qty))
-            self.pnl.realized += closing * (price - state.vwap)
-        elif pre_position < 0 and signed_qty > 0:
-            closing = min(abs(pre_position), signed_qty)
-            self.pnl.realized += closing * (state.vwap - price)
-
-        new_position = pre_position + signed_qty
-
-        if pre_position == 0 or (pre_position > 0 and signed_qty > 0) or (pre_position < 0 and signed_qty < 0):
-            total_size = abs(pre_position) + abs(signed_qty)
-            if total_size > 0:
-                state.vwap = (
-                    (state.vwap * abs(pre_position)) + (price * abs(signed_qty))
-                ) / total_size
-        else:
-            residual = new_position
-            if residual == 0:
-                state.vwap = price
-            elif (residual > 0 and signed_qty > 0) or (residual < 0 and signed_qty < 0):
-                state.vwap = price
-
-        state.position = new_position
+        state.position, state.vwap, realized = risk.apply_fill(
+            state.position, signed_qty, state.vwap, price
+        )
+        self.pnl.realized += realized
+        self._refresh_symbol_risk(symbol)
 
-    async def _refresh_order_books(self) -> None:
-        tasks = [self.client.get_order_book(symbol) for symbol in config.ALL_SYMBOLS]
-        snapshots = await asyncio.gather(*tasks, return_exceptions=True)
-        for symbol, snapshot in zip(config.ALL_SYMBOLS, snapshots):
-            if isinstance(snapshot, Exception):
-                self._logger.debug("orderbook refresh failed", exc_info=snapshot)
+    def _refresh_order_books(self) -> None:
+        for symbol, snapshot in self.client.order_books.items():
+            if self.market.get(symbol) is snapshot:
                 continue
             self.market[symbol] = snapshot
-            self._update_volatility(symbol, snapshot.order_book.mid)
+            mid = snapshot.order_book.mid
+            if mid is None:
+                self._mid_map.pop(symbol, None)
+            else:
+                self._mid_map[symbol] = mid
+            self._update_volatility(symbol, mid)
+            self._refresh_symbol_risk(symbol)
 
-    def _mid_map(self) -> dict[str, float]:
-        return {
-            symbol: snapshot.order_book.mid
-            for symbol, snapshot in self.market.items()
-            if snapshot.order_book.mid is not None
-        }
+    def _refresh_symbol_risk(self, symbol: str) -> None:
+        state = self.positions[symbol]
+        mid = self._mid_map.get(symbol)
+        exposure = risk.position_exposure(state, mid)
+        unrealized = risk.position_unrealized(state, mid)
+        self._exposure += exposure - self._exposure_by_symbol[symbol]
+        self._unrealized += unrealized - self._unrealized_by_symbol[symbol]
+        self._exposure_by_symbol[symbol] = exposure
+        self._unrealized_by_symbol[symbol] = unrealized
 
     def _compute_synthetic_fair(self, mid_map: dict[str, float]) -> Optional[float]:
         weights = config.SYNTHETIC_WEIGHTS
@@ -154,100 +182,120 @@ class Strategy:
         etf_mispricing_bps: float,
     ) -> None:
         coroutines = []
-        symbol_order = sorted(
-            config.ALL_SYMBOLS,
-            key=lambda sym: self._symbol_priority(sym, etf_mispricing_bps),
-            reverse=True,
-        )
-        for symbol in symbol_order:
+        priorities = self._priority_buf
+        abs_mispricing_bps = abs(etf_mispricing_bps)
+        intensity_base = min(abs_mispricing_bps / self._intensity_denom, 1.0)
+        for index, symbol in enumerate(config.ALL_SYMBOLS):
+            priorities[index] = self._symbol_priority(symbol, abs_mispricing_bps)
+        symbol_order = sorted(range(len(priorities)), key=priorities.__getitem__, reverse=True)
+        for index in symbol_order:
+            symbol = config.ALL_SYMBOLS[index]
             snapshot = self.market.get(symbol)
             if snapshot is None:
                 continue
-            fair_value = synthetic_fair if symbol == config.ETF_SYMBOL else mid_map.get(symbol)
+            fair_value = synthetic_fair if self._is_etf[symbol] else mid_map.get(symbol)
             if fair_value is None:
                 continue
             inventory_skew = compute_inventory_skew(
                 self.positions[symbol].position, config.RISK_LIMITS.max_position
             )
-            spread_multiplier = self._spread_scale_adjust(symbol, etf_mispricing_bps)
-            bid_scale, ask_scale = self._side_size_scales(symbol, etf_mispricing_bps)
+            spread_multiplier, bid_scale, ask_scale = self._mispricing_adjustments(
+                symbol, etf_mispricing_bps, intensity_base
+            )
             ctx = QuoteContext(
                 fair_value=fair_value,
-                volatility_bps=max(1.0, self._volatility_bps.get(symbol, 5.0)),
+                volatility_bps=max(1.0, self._volatility_bps[index]),
                 inventory_skew_bps=inventory_skew,
                 spread_scale=spread_scale * spread_multiplier,
                 size_scale=size_scale,
                 bid_size_scale=bid_scale,
                 ask_size_scale=ask_scale,
             )
+            if not self._quote_moved(symbol, ctx):
+                continue
             bids, asks = build_ladders(snapshot, ctx, self.symbol_configs[symbol])
             coroutines.append(self._order_manager.sync_symbol(symbol, bids, asks))
-        if coroutines:
+            self._last_quote_ctx[symbol] = ctx
+        # The quote gate usually leaves zero or one symbol to sync; await that
+        # directly rather than paying for a gather future.
+        if len(coroutines) == 1:
+            await coroutines[0]
+        elif coroutines:
             await asyncio.gather(*coroutines)
 
-    def _symbol_priority(self, symbol: str, etf_mispricing_bps: float) -> float:
-        mispricing_component = abs(etf_mispricing_bps)
-        if symbol != config.ETF_SYMBOL:
-            mispricing_component *= config.SYNTHETIC_WEIGHTS.get(symbol, 0.0)
-        inventory_ratio = abs(self.positions[symbol].position) / max(
-            1, config.RISK_LIMITS.max_position
+    def _quote_moved(self, symbol: str, ctx: QuoteContext) -> bool:
+        """Whether ``ctx`` can shift any level of the last synced ladder by the refresh threshold."""
+
+        previous = self._last_quote_ctx.get(symbol)
+        if previous is None or previous.fair_value <= 0:
+            return True
+        if (
+            ctx.inventory_skew_bps != previous.inventory_skew_bps
+            or ctx.size_scale != previous.size_scale
+            or ctx.bid_size_scale != previous.bid_size_scale
+            or ctx.ask_size_scale != previous.ask_size_scale
+        ):
+            return True
+        cfg = self.symbol_configs[symbol]
+        widest_bps = cfg.base_spread_bps + (cfg.max_levels - 1) * cfg.level_spread_step_bps
+        fair_move_bps = abs(ctx.fair_value - previous.fair_value) / previous.fair_value * 10_000
+        offset_move_bps = (
+            abs(ctx.spread_scale - previous.spread_scale) * widest_bps
+            + abs(ctx.volatility_bps - previous.volatility_bps)
         )
-        priority = mispricing_component + inventory_ratio * config.INVENTORY_PRIORITY_WEIGHT
-        if symbol == config.ETF_SYMBOL:
-            priority += 10.0
-        return priority
+        return fair_move_bps + offset_move_bps >= config.MIN_MOVE_TO_REFRESH_BPS
+
+    def _symbol_priority(self, symbol: str, abs_mispricing_bps: float) -> float:
+        return (
+            abs_mispricing_bps * self._weights[symbol]
+            + abs(self.positions[symbol].position) * self._inventory_priority_scale
+            + self._priority_bonus[symbol]
+        )
+
+    def _intensity_from_base(self, intensity_base: float, weight: float = 1.0) -> float:
+        """Scale the tick-wide mispricing intensity (already in [0, 1]) by a symbol weight."""
 
-    def _mispricing_intensity(self, etf_mispricing_bps: float, weight: float = 1.0) -> float:
         if weight <= 0:
             return 0.0
-        base = min(abs(etf_mispricing_bps) / max(1.0, config.MISPRICING_INTENSITY_BPS), 1.0)
-        return max(0.0, min(1.0, base * weight))
+        return max(0.0, min(1.0, intensity_base * weight))
 
-    def _spread_scale_adjust(self, symbol: str, etf_mispricing_bps: float) -> float:
-        weight = 1.0 if symbol == config.ETF_SYMBOL else config.SYNTHETIC_WEIGHTS.get(symbol, 0.0)
-        intensity = self._mispricing_intensity(etf_mispricing_bps, weight)
-        return 1.0 + intensity * config.MISPRICING_SPREAD_WIDEN
+    def _mispricing_adjustments(
+        self, symbol: str, etf_mispricing_bps: float, intensity_base: float
+    ) -> tuple[float, float, float]:
+        """Return ``(spread_multiplier, bid_size_scale, ask_size_scale)`` for ``symbol``."""
 
-    def _side_size_scales(self, symbol: str, etf_mispricing_bps: float) -> tuple[float, float]:
-        weight = 1.0 if symbol == config.ETF_SYMBOL else config.SYNTHETIC_WEIGHTS.get(symbol, 0.0)
+        weight = self._weights[symbol]
         if etf_mispricing_bps == 0.0 or weight <= 0:
-            return 1.0, 1.0
-        intensity = self._mispricing_intensity(etf_mispricing_bps, weight)
-        bonus = 1.0 + intensity * config.MISPRICING_SIZE_BONUS
-        penalty = max(0.5, 1.0 - intensity * config.MISPRICING_SIZE_PENALTY)
-        if symbol == config.ETF_SYMBOL:
-            if etf_mispricing_bps > 0:
-                return penalty, bonus
-            return bonus, penalty
-        if etf_mispricing_bps > 0:
-            return bonus, penalty
-        return penalty, bonus
+            return 1.0, 1.0, 1.0
+        intensity = self._intensity_from_base(intensity_base, weight)
+        spread = 1.0 + intensity * self._spread_widen
+        bonus = 1.0 + intensity * self._size_bonus
+        penalty = max(0.5, 1.0 - intensity * self._size_penalty)
+        if self._etf_sign[symbol] * etf_mispricing_bps > 0:
+            return spread, penalty, bonus
+        return spread, bonus, penalty
 
     def _update_volatility(self, symbol: str, mid: Optional[float]) -> None:
         if mid is None or mid <= 0:
             return
-        previous = self._last_mid.get(symbol)
-        self._last_mid[symbol] = mid
-        if previous is None or previous <= 0:
-            self._volatility_bps[symbol] = max(5.0, self._volatility_bps.get(symbol, 5.0))
+        index = self._symbol_index[symbol]
+        previous = self._last_mid[index]
+        self._last_mid[index] = mid
+        if previous <= 0:
+            self._volatility_bps[index] = max(5.0, self._volatility_bps[index])
             return
-        move_bps = abs(mid - previous) / previous * 10_000
-        alpha = config.VOL_SMOOTHING_ALPHA
-        prior = self._volatility_bps.get(symbol, move_bps)
-        self._volatility_bps[symbol] = (1 - alpha) * prior + alpha * move_bps
+        self._volatility_bps[index] = (
+            self._vol_decay * self._volatility_bps[index]
+            + self._vol_gain * abs(mid - previous) / previous
+        )
 
     def _resting_notional_scale(self, mid_map: dict[str, float]) -> float:
         base = 0.0
-        for symbol, cfg in self.symbol_configs.items():
+        for symbol, cfg in self._symbol_configs_tuple:
             mid = mid_map.get(symbol)
             if mid is None:
                 continue
-            size_sum = 0.0
-            size = cfg.base_size
-            for _ in range(cfg.max_levels):
-                size_sum += size
-                size = max(1, int(size * cfg.size_multiplier))
-            base += 2 * mid * size_sum
+            base += 2 * mid * cfg.size_sum
         if base <= 0:
             return 1.0
         ratio = config.TARGET_RESTING_NOTIONAL / base
@@ -262,15 +310,17 @@ class Strategy:
 
     def _maybe_log_metrics(
         self,
+        now: float,
         etf_mispricing_bps: float,
         exposure: float,
         drawdown_pct: float,
         size_scale: float,
     ) -> None:
-        now = time.monotonic()
         if now - self._last_metrics_log < config.TELEMETRY_INTERVAL_SECONDS:
             return
         self._last_metrics_log = now
+        if not self._logger.isEnabledFor(logging.INFO):
+            return
         self._logger.info(
             "telemetry mispricing=%.1fbps exposure=$%.0f drawdown=%.2f%% size_scale=%.2f realized=$%.0f unrealized=$%.0f",
             etf_mispricing_bps,
@@ -281,8 +331,10 @@ class Strategy:
             self.pnl.unrealized,
         )
 
-    async def _sleep(self, loop_start: float) -> None:
-        elapsed = time.perf_counter() - loop_start
+    async def _sleep(self, loop_start: float, now: float) -> None:
+        """Pad the iteration to LOOP_DELAY_SECONDS; ``now`` is the caller's perf_counter read."""
+
+        elapsed = now - loop_start
         delay = max(0.0, config.LOOP_DELAY_SECONDS - elapsed)
         if delay > 0:
             await asyncio.sleep(delay)
@@ -1,76 +1,123 @@
 import pandas as pd
 import numpy as np
+import matplotlib
+
+matplotlib.use("Agg")  # headless: figures are written to PNG instead of shown
 import matplotlib.pyplot as plt
 from statsmodels.tsa.stattools import adfuller
 from statsmodels.tsa.api import VAR
-import seaborn as sns
 
 # -------------------------
 # 1. Load CSV
 # -------------------------
-df = pd.read_csv("prices.csv") 
-df.columns = ["time", "gold", "green"]
+# Name and type the columns up front so pandas skips header renaming and type inference
+df = pd.read_csv(
+    "prices.csv",
+    header=0,
+    names=["time", "gold", "green"],
+    dtype={"time": "int64", "gold": "float64", "green": "float64"},
+)
 
 # Ensure time is sorted
-df = df.sort_values("time")
+df = df.sort_values("time", ignore_index=True)
 
 # -------------------------
 # 2. Compute returns & features
 # -------------------------
-df["gold_return"] = df["gold"].pct_change()
-df["green_return"] = df["green"].pct_change()
-
-df["gold_diff"] = df["gold"].diff()
-df["green_diff"] = df["green"].diff()
+# Diffs and returns stay plain ndarrays (gold, green columns) written into
+# preallocated buffers; nothing downstream needs them as DataFrame columns
+prices = df[["gold", "green"]].to_numpy()
+diffs = np.empty((len(prices) - 1, 2))
+np.subtract(prices[1:], prices[:-1], out=diffs)
+returns = np.empty_like(diffs)
+np.divide(diffs, prices[:-1], out=returns)
 
-# Drop first NA row
-df = df.dropna()
+# Drop the first row, which has no previous price
+df = df.iloc[1:]
 
 # -------------------------
 # 3. Basic analysis
 # -------------------------
 print("\n--- Correlation Matrix ---")
-print(df[["gold", "green", "gold_return", "green_return"]].corr())
+corr_cols = ["gold", "green", "gold_return", "green_return"]
+corr = np.corrcoef(np.column_stack([prices[1:], returns]), rowvar=False)
+print(pd.DataFrame(corr, index=corr_cols, columns=corr_cols))
 
-# Plot prices
+# Plot prices, thinned to ~5000 points so long series rasterize quickly
+step = max(1, len(df) // 5000)
+d = df.iloc[::step]
 plt.figure(figsize=(10,5))
-plt.plot(df["time"], df["gold"], label="Gold")
-plt.plot(df["time"], df["green"], label="Green")
+plt.plot(d["time"], d["gold"], label="Gold")
+plt.plot(d["time"], d["green"], label="Green")
 plt.title("Gold & Green Prices")
 plt.legend()
-plt.show()
+plt.savefig("prices.png", dpi=100)
 
 # -------------------------
 # 4. Stationarity check (ADF)
 # -------------------------
-def adf_test(series, title=""):
-    result = adfuller(series)
+def adf_test(series, title="", k=5):
+    # Fixed lag order skips the autolag search over every candidate regression
+    result = adfuller(series, maxlag=k, autolag=None)
     print(f"\nADF test for {title}")
     print(f"ADF Statistic: {result[0]}")
     print(f"p-value: {result[1]}")
 
-adf_test(df["gold"], "gold")
-adf_test(df["green"], "green")
+# Price matrix shared by the ADF tests and the forecast seed (a view, no copy)
+mdv = prices[1:]
+
+adf_test(mdv[:, 0], "gold")
+adf_test(mdv[:, 1], "green")
 
 # -------------------------
 # 5. Fit VAR model
 # -------------------------
-model_data = df[["gold", "green"]]
+def fit_var_lstsq(data, lag):
+    """OLS fit of a VAR(lag) with intercept.
+
+    Returns B with rows [const, lag 1 block, ..., lag `lag` block], the same
+    coefficients statsmodels' VAR(data).fit(lag) estimates.
+    """
+    n = len(data)
+    X = np.hstack(
+        [np.ones((n - lag, 1))] + [data[lag - i - 1 : n - i - 1] for i in range(lag)]
+    )
+    B, *_ = np.linalg.lstsq(X, data[lag:], rcond=None)
+    return B
+
+
+def var_forecast(B, history, lag, steps):
+    """Iterate the fitted VAR forward `steps` periods from the end of `history`.
+
+    Forecasts are written into one preallocated buffer behind the seed
+    window, so each step is a single matrix-vector product over a
+    contiguous slice with no per-step concatenation.
+    """
+    k = history.shape[1]
+    # Lag blocks reordered oldest-first to match the window's row order
+    W = B[1:].reshape(lag, k, k)[::-1].reshape(lag * k, k)
+    buf = np.empty((lag + steps, k))
+    buf[:lag] = history[len(history) - lag :]
+    for t in range(steps):
+        buf[lag + t] = B[0] + buf[t : t + lag].reshape(-1) @ W
+    return buf[lag:]
+
 
-# Select best lag
-model = VAR(model_data)
+# Select best lag (statsmodels only for the exploratory lag search)
+model = VAR(mdv)
 lag = model.select_order(maxlags=5).selected_orders['aic']
 print(f"\nBest lag based on AIC: {lag}")
 
 # Fit model
-results = model.fit(lag)
-print(results.summary())
+B = fit_var_lstsq(mdv, lag)
+coef_index = ["const"] + [f"L{l}.{name}" for l in range(1, lag + 1) for name in ("gold", "green")]
+print(pd.DataFrame(B, index=coef_index, columns=["gold", "green"]))
 
 # -------------------------
 # 6. Forecast 10 future steps (5 minutes)
 # -------------------------
 steps = 10
-forecast = results.forecast(model_data.values[-lag:], steps=steps)
+forecast = var_forecast(B, mdv, lag, steps)
 forecast_df = pd.DataFrame(forecast, columns=["gold_forecast", "green_forecast"])
 print("\n--- 10-Step Forecast ---")
 print(forecast_df)
@@ -85,5 +132,5 @@ plt.plot(range(len(df), len(df)+steps), forecast_df["gold_forecast"], '--', labe
 plt.plot(range(len(df), len(df)+steps), forecast_df["green_forecast"], '--', label="Green Forecast")
 plt.title("Actual vs Forecast - VAR Model")
 plt.legend()
-plt.show()
+plt.savefig("forecast.png", dpi=100)
 